@@ -5,28 +5,74 @@ Access To Do lists and tasks using Microsoft Graph API
 """
 
 # type: ignore  # Ignore missing type hints in msal library
+# PYTHON_ARGCOMPLETE_OK
 
-import requests
 import json
 import os
 import atexit
 import argparse
 import sys
 import io
+import time
+import hashlib
+import re
+import heapq
+import tempfile
+import shutil
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Set default encoding to UTF-8 ---
-if sys.stdout.encoding != 'utf-8':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-if sys.stderr.encoding != 'utf-8':
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
-if sys.stdin.encoding != 'utf-8':
-    sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+# Reconfigure the standard streams in place; only streams without reconfigure() get rewrapped
+for _stream_name in ("stdout", "stderr", "stdin"):
+    _stream = getattr(sys, _stream_name)
+    if _stream.encoding != 'utf-8':
+        if hasattr(_stream, "reconfigure"):
+            _stream.reconfigure(encoding='utf-8')
+        else:
+            setattr(sys, _stream_name, io.TextIOWrapper(_stream.buffer, encoding='utf-8'))
 # ------------------------------------
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Sequence, Iterable, Iterator, Tuple
 from pathlib import Path
-from datetime import datetime, timedelta
-import msal  # type: ignore
+from urllib.parse import urlencode, quote
+from email.utils import parsedate_to_datetime
+from datetime import date, datetime, timedelta, timezone
+try:
+    import orjson  # Optional: faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+try:
+    import ciso8601  # Optional: C implementation of ISO 8601 parsing
+except ImportError:
+    ciso8601 = None
+
+# Shared empty mapping for missing nested fields (never mutated)
+_EMPTY = {}
+
+# Time zone sent with every dateTimeTimeZone value; callers pass UTC timestamps
+_UTC = "UTC"
+
+# Task list fields used by the commands; passed as $select when fetching lists
+_LIST_FIELDS = ("id", "displayName", "wellknownListName")
+
+# Task fields used by the today view
+_TASK_TODAY_FIELDS = ("id", "title", "status", "importance", "dueDateTime")
+
+# Task fields used by the list views; passed as $select to trim Graph responses
+_TASK_VIEW_FIELDS = ("id", "title", "status", "importance", "dueDateTime", "body", "categories", "lastModifiedDateTime")
+
+# Task fields shown by the detail view
+_TASK_DETAIL_FIELDS = _TASK_VIEW_FIELDS + (
+    "reminderDateTime",
+    "createdDateTime",
+    "completedDateTime",
+    "recurrence",
+    "isReminderOn",
+)
 
 
 class MicrosoftTodoClient:
@@ -35,6 +81,62 @@ class MicrosoftTodoClient:
     # Default client ID (built-in)
     DEFAULT_CLIENT_ID = "82faeadf-5106-4aa0-bb0d-2c94b300e92a"
 
+    __slots__ = (
+        "client_id", "client_secret", "tenant_id", "authority", "access_token", "debug", "_session",
+        "cache_file", "cache", "_cache_digest", "_cache_mtime", "_app", "flow_cache_file", "_device_flow",
+        "delta_cache_file", "_delta_cache", "_delta_cache_changed",
+        "_lists_cache", "_lists_cached_at", "_tasks_cache", "_lists_by_name", "_lists_by_folded", "_lists_by_wkn",
+        "_tasks_by_title",
+    )
+
+    # Delegated permissions requested for the signed-in user
+    SCOPES = ("Tasks.Read", "Tasks.ReadWrite")
+
+    # Microsoft Graph API base URL
+    GRAPH_ENDPOINT = "https://graph.microsoft.com/v1.0"
+
+    # Graph endpoint templates, relative to GRAPH_ENDPOINT
+    LISTS_PATH = "/me/todo/lists"
+    LIST_PATH = "/me/todo/lists/%s"
+    TASKS_PATH = "/me/todo/lists/%s/tasks"
+    TASK_PATH = "/me/todo/lists/%s/tasks/%s"
+    TASKS_DELTA_PATH = "/me/todo/lists/%s/tasks/delta"
+
+    # Number of task lists fetched concurrently; the session pool is sized from it
+    MAX_WORKERS = 8
+
+    # Maximum number of subrequests accepted by the Graph $batch endpoint
+    BATCH_LIMIT = 20
+
+    # Extra $batch rounds for throttled or gateway-failed subrequests before they are left to individual requests
+    BATCH_RETRIES = 2
+
+    # Retries for throttling and gateway errors, with exponential backoff (seconds) unless Retry-After says otherwise
+    RETRY_TOTAL = 5
+    RETRY_BACKOFF = 0.5
+    RETRY_STATUSES = (429, 502, 503, 504)
+
+    # Page size requested for collection queries ($top); further pages follow @odata.nextLink
+    PAGE_SIZE = 999
+
+    # Maximum number of candidates returned by a server-side title search
+    SEARCH_LIMIT = 10
+
+    # Response bodies larger than this (bytes) are not dumped in debug mode
+    DEBUG_BODY_LIMIT = 64 * 1024
+
+    # Seconds the memoized task lists are reused before being fetched again
+    LISTS_CACHE_TTL = 60
+
+    # Bump when the on-disk delta cache layout changes
+    DELTA_CACHE_VERSION = 1
+
+    # Cached access tokens this close to expiry (seconds) are left to MSAL to refresh
+    TOKEN_EXPIRY_SKEW = 300
+
+    # Tenants that do not pin the realm of cached tokens
+    MULTI_TENANTS = frozenset({"common", "organizations", "consumers"})
+
     def __init__(self, client_id: Optional[str] = None, client_secret: Optional[str] = None, tenant_id: str = "common", cache_file: Optional[str] = None, debug: bool = False):
         """
         Initialize the client
@@ -50,30 +152,193 @@ class MicrosoftTodoClient:
         self.client_secret = client_secret
         self.tenant_id = tenant_id
         self.authority = f"https://login.microsoftonline.com/{tenant_id}"
-        self.scopes = ["Tasks.Read", "Tasks.ReadWrite"]
-        self.graph_endpoint = "https://graph.microsoft.com/v1.0"
         self.access_token = None
         self.debug = debug
 
+        # Pooled HTTP session, created on first use so requests is never imported by logout
+        self._session = None
+
         # Set cache file path
         if cache_file is None:
             cache_file = os.path.join(Path.home(), ".mstodo_token_cache.json")
         self.cache_file = cache_file
 
-        # Initialize token cache
-        self.cache = msal.SerializableTokenCache()
-        if os.path.exists(self.cache_file):
-            with open(self.cache_file, "r") as f:
-                self.cache.deserialize(f.read())
+        # Token cache, loaded on first use so logout never reads or parses it
+        self.cache = None
+        self._cache_digest = None
+        self._cache_mtime = None
+
+        # MSAL application bound to the token cache, created on first use
+        self._app = None
+
+        # Device code flow of step 1, kept in memory and in a file for step 2
+        self.flow_cache_file = os.path.join(Path.home(), ".mstodo_device_flow.json")
+        self._device_flow: Optional[Dict[str, Any]] = None
+
+        # Task snapshots and delta links per list, loaded on first use
+        self.delta_cache_file = os.path.join(Path.home(), ".mstodo_delta_cache.json")
+        self._delta_cache = None
+        self._delta_cache_changed = False
+
+        # Per-invocation memo of task lists and unfiltered tasks by list ID
+        self._lists_cache: Optional[List[Dict[str, Any]]] = None
+        self._lists_cached_at = 0.0
+        self._tasks_cache: Dict[str, List[Dict[str, Any]]] = {}
+
+        # Name/title indexes over the memoized lists and tasks
+        self._lists_by_name: Dict[str, Dict[str, Any]] = {}
+        self._lists_by_folded: Dict[str, Dict[str, Any]] = {}
+        self._lists_by_wkn: Dict[str, Dict[str, Any]] = {}
+        self._tasks_by_title: Dict[str, Dict[str, Dict[str, Any]]] = {}
 
         # Register cache saving on exit
         atexit.register(self._save_cache)
+        atexit.register(self._save_delta_cache)
+
+    @property
+    def session(self):
+        """Shared HTTP session; keep-alive connections are reused across calls"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            # Throttling and gateway errors are retried with backoff, honouring Retry-After;
+            # POST stays out because creating a task twice is worse than failing once
+            # (the read-only $batch POST is retried by _post_batch instead)
+            retries = Retry(
+                total=self.RETRY_TOTAL,
+                backoff_factor=self.RETRY_BACKOFF,
+                status_forcelist=list(self.RETRY_STATUSES),
+                allowed_methods=["GET", "PATCH", "DELETE"],
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            # Every concurrent worker gets its own keep-alive connection to Graph
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=2 * self.MAX_WORKERS, max_retries=retries)
+            session.mount("https://", adapter)
+            session.headers.update({"Content-Type": "application/json"})
+            atexit.register(session.close)
+            self._session = session
+        return self._session
+
+    @staticmethod
+    def _write_file_atomic(path: str, payload: bytes):
+        """Write a file through a temporary file and rename, so readers never see a partial write"""
+        # A unique temporary file (created 0600) keeps concurrent writers from sharing one
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".")
+        try:
+            with open(fd, "wb", buffering=64 * 1024) as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _load_cache(self):
+        """Load the MSAL token cache from file (once per client)"""
+        if self.cache is None:
+            # msal is imported lazily so --help, parser errors and logout do not pay for it
+            import msal  # type: ignore
+
+            self.cache = msal.SerializableTokenCache()
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, "rb") as f:
+                    payload = f.read()
+                    self._cache_mtime = os.fstat(f.fileno()).st_mtime_ns
+                self._cache_digest = hashlib.sha1(payload).hexdigest()
+                self.cache.deserialize(payload.decode("utf-8"))
+        return self.cache
+
+    def _get_app(self):
+        """Get the MSAL public client application (created once per client)"""
+        if self._app is None:
+            import msal  # type: ignore
+
+            self._app = msal.PublicClientApplication(self.client_id, authority=self.authority, token_cache=self._load_cache())
+        return self._app
 
     def _save_cache(self):
         """Save token cache to file"""
-        if self.cache.has_state_changed:
-            with open(self.cache_file, "w") as f:
-                f.write(self.cache.serialize())
+        if self.cache is not None and self.cache.has_state_changed:
+            payload = self.cache.serialize().encode("utf-8")
+            merged = self._merge_cache_file(payload)
+            if merged is not payload:
+                # Keep the in-memory cache in step with what is written
+                payload = merged
+                self.cache.deserialize(payload.decode("utf-8"))
+            # Skip the write when the serialized state matches what is already on disk
+            digest = hashlib.sha1(payload).hexdigest()
+            if digest != self._cache_digest:
+                self._write_file_atomic(self.cache_file, payload)
+                self._cache_digest = digest
+                self._cache_mtime = os.stat(self.cache_file).st_mtime_ns
+
+    def _merge_cache_file(self, payload: bytes) -> bytes:
+        """
+        Merge the serialized token cache into the file if another process rewrote it since it was loaded
+
+        Args:
+            payload: Serialized token cache of this client
+
+        Returns:
+            Payload to write; entries of this client win over those on disk
+        """
+        try:
+            mtime = os.stat(self.cache_file).st_mtime_ns
+        except OSError:
+            return payload
+        if mtime == self._cache_mtime:
+            return payload
+
+        try:
+            with open(self.cache_file, "rb") as f:
+                on_disk = _loads(f.read())
+        except (OSError, ValueError):
+            # Unreadable file: ours replaces it
+            return payload
+        if not isinstance(on_disk, dict):
+            return payload
+
+        # The cache is a mapping of sections (AccessToken, RefreshToken, Account...) to entries by key
+        for section, entries in _loads(payload).items():
+            if isinstance(entries, dict) and isinstance(on_disk.get(section), dict):
+                on_disk[section].update(entries)
+            else:
+                on_disk[section] = entries
+        return _dumps(on_disk)
+
+    def _load_delta_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load the task delta cache from file (once per client)"""
+        if self._delta_cache is None:
+            self._delta_cache = {}
+            if os.path.exists(self.delta_cache_file):
+                try:
+                    with open(self.delta_cache_file, "rb") as f:
+                        data = _loads(f.read())
+                    lists = data.get("lists") if isinstance(data, dict) else None
+                    if isinstance(lists, dict) and data.get("version") == self.DELTA_CACHE_VERSION:
+                        # Malformed list entries are dropped and resynced from scratch
+                        self._delta_cache = {
+                            list_id: entry
+                            for list_id, entry in lists.items()
+                            if isinstance(entry, dict) and isinstance(entry.get("tasks"), dict)
+                        }
+                except (OSError, ValueError):
+                    # A corrupt cache only costs a full resync
+                    pass
+        return self._delta_cache
+
+    def _save_delta_cache(self):
+        """Save task delta cache to file"""
+        if self._delta_cache_changed:
+            data = {"version": self.DELTA_CACHE_VERSION, "lists": self._delta_cache}
+            self._write_file_atomic(self.delta_cache_file, _dumps(data))
+            self._delta_cache_changed = False
 
     def authenticate(self, force_refresh: bool = False):
         """
@@ -85,21 +350,64 @@ class MicrosoftTodoClient:
         Returns:
             True if authentication is successful, False if no valid token in cache
         """
-        app = msal.PublicClientApplication(self.client_id, authority=self.authority, token_cache=self.cache)
+        # A still-valid access token in the cache file needs neither msal nor the network
+        if not force_refresh:
+            access_token = self._cached_access_token()
+            if access_token:
+                self._set_access_token(access_token)
+                return True
+
+        app = self._get_app()
 
         # If not forcing refresh, try to get token from cache first
         if not force_refresh:
             accounts = app.get_accounts()
             if accounts:
                 # Try to silently acquire token
-                result = app.acquire_token_silent(self.scopes, account=accounts[0])
+                result = app.acquire_token_silent(self.SCOPES, account=accounts[0])
                 if result and "access_token" in result:
-                    self.access_token = result["access_token"]
+                    self._set_access_token(result["access_token"])
                     return True
 
         # No valid token found, return False and let caller handle it
         return False
 
+    def _cached_access_token(self) -> Optional[str]:
+        """
+        Read an unexpired access token for this client and its scopes straight from the MSAL cache file
+
+        Returns:
+            Access token, or None if MSAL has to acquire or refresh one
+        """
+        try:
+            with open(self.cache_file, "rb") as f:
+                payload = f.read()
+            data = _loads(payload)
+        except (OSError, ValueError):
+            return None
+
+        scopes = {scope.lower() for scope in self.SCOPES}
+        deadline = time.time() + self.TOKEN_EXPIRY_SKEW
+        for entry in data.get("AccessToken", {}).values():
+            if entry.get("client_id") != self.client_id:
+                continue
+            if self.tenant_id not in self.MULTI_TENANTS and entry.get("realm") != self.tenant_id:
+                continue
+            if not scopes <= set(entry.get("target", "").lower().split()):
+                continue
+            try:
+                expires_on = int(entry["expires_on"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if expires_on > deadline and entry.get("secret"):
+                return entry["secret"]
+        return None
+
+    def _set_access_token(self, access_token: str):
+        """Store the access token and attach it to the shared session"""
+        self.access_token = access_token
+        self.session.headers["Authorization"] = f"Bearer {access_token}"
+
     def get_device_code_flow(self) -> Optional[Dict[str, Any]]:
         """
         Get device code flow information (Step 1 login: Get verification code)
@@ -107,9 +415,9 @@ class MicrosoftTodoClient:
         Returns:
             Flow information containing user_code and device_code, or None if failed
         """
-        app = msal.PublicClientApplication(self.client_id, authority=self.authority, token_cache=self.cache)
+        app = self._get_app()
 
-        flow = app.initiate_device_flow(scopes=self.scopes)
+        flow = app.initiate_device_flow(scopes=self.SCOPES)
 
         if "user_code" not in flow:
             error_msg = flow.get("error", "Unknown error")
@@ -119,10 +427,13 @@ class MicrosoftTodoClient:
             print(f"Description: {error_desc}")
             return None
 
-        # Save flow information for step 2 use
-        flow_cache_file = os.path.join(Path.home(), ".mstodo_device_flow.json")
-        with open(flow_cache_file, "w") as f:
-            json.dump(flow, f)
+        # Save flow information for step 2 use (the file only serves a later process)
+        self._device_flow = flow
+        fd = os.open(self.flow_cache_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.write(fd, _dumps(flow))
+        finally:
+            os.close(fd)
 
         # Only display information users need
         print(f"✓ Verification code generated")
@@ -140,31 +451,33 @@ class MicrosoftTodoClient:
         Returns:
             True if login is successful
         """
-        flow_cache_file = os.path.join(Path.home(), ".mstodo_device_flow.json")
-
-        if not os.path.exists(flow_cache_file):
-            print("✗ No flow information found to verify")
-            print("Please run first: ms-todo-sync.py login get")
-            return False
+        flow = self._device_flow
+        if flow is None:
+            if not os.path.exists(self.flow_cache_file):
+                print("✗ No flow information found to verify")
+                print("Please run first: ms-todo-sync.py login get")
+                return False
 
-        try:
-            with open(flow_cache_file, "r") as f:
-                flow = json.load(f)
-        except Exception as e:
-            print(f"✗ Failed to read flow information: {e}")
-            return False
+            try:
+                with open(self.flow_cache_file, "rb") as f:
+                    flow = _loads(f.read())
+            except Exception as e:
+                print(f"✗ Failed to read flow information: {e}")
+                return False
 
-        app = msal.PublicClientApplication(self.client_id, authority=self.authority, token_cache=self.cache)
+        app = self._get_app()
 
         # Wait for user to complete authentication
         result = app.acquire_token_by_device_flow(flow)
 
         if "access_token" in result:
-            self.access_token = result["access_token"]
+            self._set_access_token(result["access_token"])
             self._save_cache()  # Save cache immediately
             print("✓ Authentication successful! Login information saved, you will be logged in automatically next time.")
             # Clear flow cache
-            os.remove(flow_cache_file)
+            self._device_flow = None
+            if os.path.exists(self.flow_cache_file):
+                os.remove(self.flow_cache_file)
             return True
         else:
             print(f"✗ Authentication failed: {result.get('error_description')}")
@@ -175,7 +488,16 @@ class MicrosoftTodoClient:
         Logout and clear cached tokens
         """
         self.access_token = None
-        self.cache = msal.SerializableTokenCache()
+        if self._session is not None:
+            self._session.headers.pop("Authorization", None)
+        self.cache = None
+        self._cache_digest = None
+        self._cache_mtime = None
+        self._app = None
+        self._delta_cache = {}
+        self._delta_cache_changed = False
+        if os.path.exists(self.delta_cache_file):
+            os.remove(self.delta_cache_file)
         if os.path.exists(self.cache_file):
             os.remove(self.cache_file)
             print("✓ Login information cleared")
@@ -196,42 +518,36 @@ class MicrosoftTodoClient:
         if not self.access_token:
             raise ValueError("Not authenticated, please call authenticate method first")
 
-        headers = {"Authorization": f"Bearer {self.access_token}", "Content-Type": "application/json"}
-
-        url = f"{self.graph_endpoint}{endpoint}"
+        url = self.GRAPH_ENDPOINT + endpoint
 
         if self.debug:
             print(f"\n🔍 [DEBUG] API Request:")
             print(f"  Method: {method}")
             print(f"  URL: {url}")
             if data:
-                print(f"  Request Body: {json.dumps(data, indent=2, ensure_ascii=False)}")
-
-        if method == "GET":
-            response = requests.get(url, headers=headers)
-        elif method == "POST":
-            response = requests.post(url, headers=headers, json=data)
-        elif method == "PATCH":
-            response = requests.patch(url, headers=headers, json=data)
-        elif method == "DELETE":
-            response = requests.delete(url, headers=headers)
-        else:
+                self._dbg("Request Body", data)
+
+        if method not in ("GET", "POST", "PATCH", "DELETE"):
             raise ValueError(f"Unsupported HTTP method: {method}")
 
+        if data is not None and orjson:
+            # Encode the body with orjson; the session already sends Content-Type: application/json
+            response = self.session.request(method, url, data=orjson.dumps(data), timeout=(5, 30))
+        else:
+            response = self.session.request(method, url, json=data, timeout=(5, 30))
+
         if self.debug:
             print(f"\n🔍 [DEBUG] API Response:")
             print(f"  Status Code: {response.status_code}")
             print(f"  Headers: {dict(response.headers)}")
 
-        if response.status_code >= 400:
+        if self.debug and response.status_code >= 400:
             # Try to parse error response
             try:
-                error_data = response.json()
-                if self.debug:
-                    print(f"  Error Body: {json.dumps(error_data, indent=2, ensure_ascii=False)}\n")
-            except:
+                self._dbg("Error Body", _loads(response.content), len(response.content), end="\n\n")
+            except ValueError:
                 pass
-        
+
         response.raise_for_status()
 
         if response.status_code == 204:  # No Content
@@ -239,23 +555,185 @@ class MicrosoftTodoClient:
                 print(f"  Body: (No Content)\n")
             return {}
 
-        response_data = response.json()
+        content = response.content
+        response_data = _loads(content)
         if self.debug:
-            print(f"  Body: {json.dumps(response_data, indent=2, ensure_ascii=False)}\n")
-        
+            self._dbg("Body", response_data, len(content), end="\n\n")
+
         return response_data
 
+    def _dbg(self, label: str, obj: Any, size: Optional[int] = None, end: str = "\n"):
+        """
+        Print a JSON value in debug mode
+
+        Args:
+            label: Label printed before the value
+            obj: Value to print, indented
+            size: Size of the raw body in bytes; bodies over DEBUG_BODY_LIMIT are summarized (optional)
+            end: Line ending passed to print (default: newline)
+        """
+        if size is not None and size > self.DEBUG_BODY_LIMIT:
+            print(f"  {label}: ({size} bytes, not shown)", end=end)
+        else:
+            print(f"  {label}: {_dumps_pretty(obj).decode('utf-8')}", end=end)
+
+    def _batch_get(self, endpoints: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Send GET requests through the Graph JSON batching endpoint
+
+        Args:
+            endpoints: Endpoint paths relative to the Graph API root
+
+        Returns:
+            Response bodies in the same order as endpoints, None for subrequests
+            that must be retried individually (still throttled or failing with a
+            gateway error after BATCH_RETRIES rounds, or expired delta links)
+        """
+        import requests
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(endpoints)
+        pending = list(range(len(endpoints)))
+
+        for attempt in range(self.BATCH_RETRIES + 1):
+            throttled = []
+            retry_after = 0
+
+            for start in range(0, len(pending), self.BATCH_LIMIT):
+                chunk = pending[start:start + self.BATCH_LIMIT]
+                data = {"requests": [{"id": str(index), "method": "GET", "url": endpoints[index]} for index in chunk]}
+                result = self._post_batch(data)
+
+                for response in result.get("responses", []):
+                    index = int(response["id"])
+                    status = response.get("status", 500)
+                    if status in self.RETRY_STATUSES:
+                        # Throttled or transient gateway error: resend it in the next round
+                        headers = response.get("headers") or {}
+                        backoff = self.RETRY_BACKOFF * (2 ** attempt)
+                        retry_after = max(retry_after, _retry_after_seconds(headers.get("Retry-After"), default=backoff))
+                        throttled.append(index)
+                        continue
+                    if status == 410:
+                        # Expired delta link: the individual request resets the sync state
+                        continue
+                    if status >= 400:
+                        error = (response.get("body") or {}).get("error", {})
+                        # Attach the subrequest status so callers can inspect it like a direct response
+                        failed = requests.Response()
+                        failed.status_code = status
+                        failed.url = endpoints[index]
+                        raise requests.HTTPError(
+                            f"{status} Error: {error.get('message', 'Batch request failed')} for url: {endpoints[index]}",
+                            response=failed,
+                        )
+                    results[index] = response.get("body") or {}
+
+            # After the last round the still failing subrequests go out individually, where the
+            # session's Retry already honours Retry-After, so only wait if another round follows
+            if not throttled or attempt == self.BATCH_RETRIES:
+                break
+            # Wait out the longest Retry-After once, then batch the failed subrequests together again
+            time.sleep(retry_after)
+            pending = sorted(throttled)
+
+        return results
+
+    def _post_batch(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send a $batch request, retrying throttling and gateway errors on the batch call itself
+
+        The session does not retry POST, but these batches only carry GET subrequests,
+        so resending them is safe.
+
+        Args:
+            data: $batch request body
+
+        Returns:
+            $batch response body
+        """
+        import requests
+
+        for attempt in range(self.RETRY_TOTAL + 1):
+            try:
+                return self._make_request("/$batch", method="POST", data=data)
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status not in self.RETRY_STATUSES or attempt == self.RETRY_TOTAL:
+                    raise
+                backoff = self.RETRY_BACKOFF * (2 ** attempt)
+                time.sleep(_retry_after_seconds(e.response.headers.get("Retry-After"), default=backoff))
+
+    def _relative_endpoint(self, url: str) -> str:
+        """Strip the Graph API root from an absolute URL returned by Graph"""
+        if url.startswith(self.GRAPH_ENDPOINT):
+            return url[len(self.GRAPH_ENDPOINT):]
+        return url
+
+    def _iter_pages(self, page: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the items of a collection response, following @odata.nextLink lazily
+
+        Args:
+            page: First page of the collection response
+
+        Yields:
+            Items page by page; the next page is only requested once the current one is consumed
+        """
+        while True:
+            yield from page.get("value", [])
+            next_link = page.get("@odata.nextLink")
+            if not next_link:
+                return
+            page = self._make_request(self._relative_endpoint(next_link))
+
+    def _collect_pages(self, page: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Collect the items of a collection response, following @odata.nextLink to the last page
+
+        Args:
+            page: First page of the collection response
+
+        Returns:
+            Items from all pages
+        """
+        return list(self._iter_pages(page))
+
     # ==================== Task List Management ====================
 
     def get_task_lists(self) -> List[Dict[str, Any]]:
         """
-        Get all task lists
+        Get all task lists (reused for LISTS_CACHE_TTL seconds)
 
         Returns:
             List containing all task list information
         """
-        result = self._make_request("/me/todo/lists")
-        return result.get("value", [])
+        now = time.monotonic()
+        if self._lists_cache is None or now - self._lists_cached_at >= self.LISTS_CACHE_TTL:
+            endpoint = self.LISTS_PATH + "?$select=" + ",".join(_LIST_FIELDS)
+            self._lists_cache = self._collect_pages(self._make_request(endpoint))
+            self._lists_cached_at = now
+            # Keep the first list for duplicate names, like a linear scan would
+            self._lists_by_name = {}
+            self._lists_by_folded = {}
+            self._lists_by_wkn = {}
+            for task_list in self._lists_cache:
+                name = task_list.get("displayName")
+                self._lists_by_name.setdefault(name, task_list)
+                self._lists_by_folded.setdefault((name or "").casefold(), task_list)
+                self._lists_by_wkn.setdefault(task_list.get("wellknownListName"), task_list)
+        return self._lists_cache
+
+    def invalidate_lists(self):
+        """Drop memoized task lists so the next lookup refetches them"""
+        self._lists_cache = None
+        self._lists_by_name = {}
+        self._lists_by_folded = {}
+        self._lists_by_wkn = {}
+
+    def invalidate_tasks(self, list_id: str):
+        """Drop memoized tasks of a list so the next lookup refetches them"""
+        self._tasks_cache.pop(list_id, None)
+        self._tasks_by_title.pop(list_id, None)
 
     def create_task_list(self, display_name: str) -> Dict[str, Any]:
         """
@@ -268,7 +746,9 @@ class MicrosoftTodoClient:
             Created task list information
         """
         data = {"displayName": display_name}
-        return self._make_request("/me/todo/lists", method="POST", data=data)
+        task_list = self._make_request(self.LISTS_PATH, method="POST", data=data)
+        self.invalidate_lists()
+        return task_list
 
     def delete_task_list(self, list_id: str) -> bool:
         """
@@ -280,23 +760,159 @@ class MicrosoftTodoClient:
         Returns:
             True if deletion is successful
         """
-        self._make_request(f"/me/todo/lists/{list_id}", method="DELETE")
+        self._make_request(self.LIST_PATH % list_id, method="DELETE")
+        self.invalidate_lists()
+        self.invalidate_tasks(list_id)
+        if self._load_delta_cache().pop(list_id, None) is not None:
+            self._delta_cache_changed = True
         return True
 
     # ==================== Task Management ====================
 
-    def get_tasks(self, list_id: str) -> List[Dict[str, Any]]:
+    @classmethod
+    def _tasks_endpoint(
+        cls,
+        list_id: str,
+        include_completed: bool = True,
+        extra_filter: Optional[str] = None,
+        select: Optional[Sequence[str]] = None,
+        top: Optional[int] = None,
+        orderby: Optional[str] = None,
+    ) -> str:
+        """Build the tasks endpoint of a list with optional $filter/$select/$top/$orderby query options"""
+        filters = []
+        if not include_completed:
+            filters.append("status ne 'completed'")
+        if extra_filter:
+            filters.append(extra_filter)
+
+        params = {"$top": str(top or cls.PAGE_SIZE)}
+        if filters:
+            params["$filter"] = " and ".join(filters)
+        if select:
+            params["$select"] = ",".join(select)
+        if orderby:
+            params["$orderby"] = orderby
+
+        return cls.TASKS_PATH % list_id + "?" + urlencode(params, quote_via=quote, safe="$,/:'()")
+
+    def _start_delta(self, list_id: str):
+        """
+        Get the delta endpoint to query for a list and the cache entry to merge into
+
+        Returns:
+            Tuple of (endpoint, cache entry)
+        """
+        entry = self._load_delta_cache().get(list_id)
+        if entry and entry.get("deltaLink"):
+            return entry["deltaLink"], entry
+        return self.TASKS_DELTA_PATH % list_id, {"deltaLink": None, "tasks": {}}
+
+    def _finish_delta(self, list_id: str, entry: Dict[str, Any], page: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Merge delta pages into the cache entry, following @odata.nextLink until the new delta link
+
+        Returns:
+            List containing all task information
+        """
+        tasks = entry["tasks"]
+        while True:
+            for task in page.get("value", []):
+                if "@removed" in task:
+                    tasks.pop(task.get("id"), None)
+                else:
+                    tasks[task["id"]] = task
+
+            next_link = page.get("@odata.nextLink")
+            if not next_link:
+                break
+            page = self._make_request(self._relative_endpoint(next_link))
+
+        if page.get("@odata.deltaLink"):
+            entry["deltaLink"] = self._relative_endpoint(page["@odata.deltaLink"])
+        self._load_delta_cache()[list_id] = entry
+        self._delta_cache_changed = True
+
+        return list(tasks.values())
+
+    def _sync_tasks(self, list_id: str) -> List[Dict[str, Any]]:
+        """
+        Get all tasks in a list via delta query, only transferring changes since the last sync
+
+        Args:
+            list_id: Task list ID
+
+        Returns:
+            List containing all task information
+        """
+        import requests
+
+        endpoint, entry = self._start_delta(list_id)
+        try:
+            page = self._make_request(endpoint)
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 410 or not entry.get("deltaLink"):
+                raise
+            # Delta link expired: drop the snapshot and sync from scratch
+            self._load_delta_cache().pop(list_id, None)
+            endpoint, entry = self._start_delta(list_id)
+            page = self._make_request(endpoint)
+
+        return self._finish_delta(list_id, entry, page)
+
+    def get_tasks(
+        self,
+        list_id: str,
+        include_completed: bool = True,
+        extra_filter: Optional[str] = None,
+        select: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Get all tasks in a specified list
 
         Args:
             list_id: Task list ID
+            include_completed: Include completed tasks (default: True)
+            extra_filter: Additional OData $filter expression evaluated by Graph (optional)
+            select: Task fields to return, all fields if not specified (optional)
 
         Returns:
             List containing all task information
         """
-        result = self._make_request(f"/me/todo/lists/{list_id}/tasks")
-        return result.get("value", [])
+        if include_completed and not extra_filter and not select:
+            tasks = self._tasks_cache.get(list_id)
+            if tasks is None:
+                tasks = self._tasks_cache[list_id] = self._sync_tasks(list_id)
+            return tasks
+
+        return self._collect_pages(self._make_request(self._tasks_endpoint(list_id, include_completed, extra_filter, select)))
+
+    def search_tasks(self, list_id: str, title_substr: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Find tasks whose title contains a substring, matched by Graph
+
+        Args:
+            list_id: Task list ID
+            title_substr: Substring to look for in task titles
+
+        Returns:
+            At most SEARCH_LIMIT matching tasks, most recently modified first,
+            or None if Graph rejected the query
+        """
+        import requests
+
+        escaped = title_substr.replace("'", "''")
+        endpoint = self._tasks_endpoint(
+            list_id,
+            extra_filter=f"contains(title,'{escaped}')",
+            select=_TASK_DETAIL_FIELDS,
+            top=self.SEARCH_LIMIT,
+            orderby="lastModifiedDateTime desc",
+        )
+        try:
+            return self._make_request(endpoint).get("value", [])
+        except requests.HTTPError:
+            return None
 
     def create_task(
         self,
@@ -327,27 +943,25 @@ class MicrosoftTodoClient:
         Returns:
             Created task information
         """
-        data = {"title": title, "importance": importance}
-
-        if body:
-            data["body"] = {"content": body, "contentType": "text"}
-
-        if start_date:
-            data["startDateTime"] = {"dateTime": start_date, "timeZone": "UTC"}
-
-        if due_date:
-            data["dueDateTime"] = {"dateTime": due_date, "timeZone": "UTC"}
-
-        if reminder_date:
-            data["reminderDateTime"] = {"dateTime": reminder_date, "timeZone": "UTC"}
-
-        if categories:
-            data["categories"] = categories
-
-        if recurrence:
-            data["recurrence"] = recurrence
-
-        return self._make_request(f"/me/todo/lists/{list_id}/tasks", method="POST", data=data)
+        # Empty optional values are left out of the body
+        data = dict(
+            (key, value)
+            for key, value in (
+                ("title", title),
+                ("importance", importance),
+                ("body", body and {"content": body, "contentType": "text"}),
+                ("startDateTime", start_date and _dt(start_date)),
+                ("dueDateTime", due_date and _dt(due_date)),
+                ("reminderDateTime", reminder_date and _dt(reminder_date)),
+                ("categories", categories),
+                ("recurrence", recurrence),
+            )
+            if value or key in ("title", "importance")
+        )
+
+        task = self._make_request(self.TASKS_PATH % list_id, method="POST", data=data)
+        self.invalidate_tasks(list_id)
+        return task
 
     def update_task(
         self,
@@ -378,30 +992,24 @@ class MicrosoftTodoClient:
         Returns:
             Updated task information
         """
-        data = {}
-
-        if title is not None:
-            data["title"] = title
-
-        if body is not None:
-            data["body"] = {"content": body, "contentType": "text"}
-
-        if due_date is not None:
-            data["dueDateTime"] = {"dateTime": due_date, "timeZone": "UTC"}
-
-        if reminder_date is not None:
-            data["reminderDateTime"] = {"dateTime": reminder_date, "timeZone": "UTC"}
-
-        if importance is not None:
-            data["importance"] = importance
-
-        if status is not None:
-            data["status"] = status
-
-        if categories is not None:
-            data["categories"] = categories
-
-        return self._make_request(f"/me/todo/lists/{list_id}/tasks/{task_id}", method="PATCH", data=data)
+        # Only fields that were passed are sent, so the PATCH leaves the others untouched
+        data = dict(
+            (key, value)
+            for key, value in (
+                ("title", title),
+                ("body", None if body is None else {"content": body, "contentType": "text"}),
+                ("dueDateTime", None if due_date is None else _dt(due_date)),
+                ("reminderDateTime", None if reminder_date is None else _dt(reminder_date)),
+                ("importance", importance),
+                ("status", status),
+                ("categories", categories),
+            )
+            if value is not None
+        )
+
+        task = self._make_request(self.TASK_PATH % (list_id, task_id), method="PATCH", data=data)
+        self.invalidate_tasks(list_id)
+        return task
 
     def complete_task(self, list_id: str, task_id: str) -> Dict[str, Any]:
         """
@@ -427,24 +1035,102 @@ class MicrosoftTodoClient:
         Returns:
             True if deletion is successful
         """
-        self._make_request(f"/me/todo/lists/{list_id}/tasks/{task_id}", method="DELETE")
+        self._make_request(self.TASK_PATH % (list_id, task_id), method="DELETE")
+        self.invalidate_tasks(list_id)
         return True
 
     # ==================== Helper Methods ====================
 
-    def get_all_tasks(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Get all tasks from all lists"""
-        all_tasks = {}
+    def iter_all_tasks(
+        self,
+        include_completed: bool = True,
+        extra_filter: Optional[str] = None,
+        select: Optional[Sequence[str]] = None,
+    ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Iterate over the tasks of all lists, one $batch round trip at a time
 
+        Args:
+            include_completed: Include completed tasks (default: True)
+            extra_filter: Additional OData $filter expression evaluated by Graph (optional)
+            select: Task fields to return, all fields if not specified (optional)
+
+        Yields:
+            Tuples of (list name, tasks) in list order
+        """
         lists = self.get_task_lists()
-        for task_list in lists:
-            list_name = task_list.get("displayName")
-            list_id = task_list.get("id")
+        if not lists:
+            return
 
-            tasks = self.get_tasks(list_id)
-            all_tasks[list_name] = tasks
+        # Unfiltered fetches go through delta queries so only changes are transferred
+        use_delta = include_completed and not extra_filter and not select
+        if use_delta:
+            delta_cache = self._load_delta_cache()
+            for stale_id in set(delta_cache) - {task_list.get("id") for task_list in lists}:
+                del delta_cache[stale_id]
+                self._delta_cache_changed = True
+
+        for start in range(0, len(lists), self.BATCH_LIMIT):
+            chunk = lists[start:start + self.BATCH_LIMIT]
+            list_ids = [task_list.get("id") for task_list in chunk]
+
+            if use_delta:
+                starts = [self._start_delta(list_id) for list_id in list_ids]
+                endpoints = [endpoint for endpoint, _ in starts]
+            else:
+                endpoints = [self._tasks_endpoint(list_id, include_completed, extra_filter, select) for list_id in list_ids]
+
+            # Fetch the whole chunk in one round trip via $batch
+            bodies = self._batch_get(endpoints)
+            results: List[Optional[List[Dict[str, Any]]]] = [None] * len(list_ids)
+            for i, body in enumerate(bodies):
+                if body is not None:
+                    if use_delta:
+                        results[i] = self._tasks_cache[list_ids[i]] = self._finish_delta(list_ids[i], starts[i][1], body)
+                    else:
+                        results[i] = self._collect_pages(body)
+
+            # Lists still throttled, or with expired delta links, fall back to individual requests, fetched concurrently
+            retry = [i for i, tasks in enumerate(results) if tasks is None]
+            if retry:
+                with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(retry))) as executor:
+                    fetched = executor.map(
+                        lambda list_id: self.get_tasks(list_id, include_completed, extra_filter, select),
+                        [list_ids[i] for i in retry],
+                    )
+                    for i, tasks in zip(retry, fetched):
+                        results[i] = tasks
+
+            for task_list, tasks in zip(chunk, results):
+                yield task_list.get("displayName"), tasks
+
+    def get_all_tasks(
+        self,
+        include_completed: bool = True,
+        extra_filter: Optional[str] = None,
+        select: Optional[Sequence[str]] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get all tasks from all lists
 
-        return all_tasks
+        Args:
+            include_completed: Include completed tasks (default: True)
+            extra_filter: Additional OData $filter expression evaluated by Graph (optional);
+                dropped if Graph rejects it, so callers must still check the condition locally
+            select: Task fields to return, all fields if not specified (optional)
+
+        Returns:
+            Dictionary mapping list names to their tasks
+        """
+        import requests
+
+        try:
+            return dict(self.iter_all_tasks(include_completed, extra_filter, select))
+        except requests.HTTPError as e:
+            if not extra_filter or e.response is None or e.response.status_code != 400:
+                raise
+            # Graph rejected the filter (400 Bad Request): fetch without it and let the caller filter
+            return dict(self.iter_all_tasks(include_completed, None, select))
 
     def get_default_list(self) -> Optional[Dict[str, Any]]:
         """
@@ -454,27 +1140,25 @@ class MicrosoftTodoClient:
             Default list information, returns None if not found
         """
         lists = self.get_task_lists()
-        for task_list in lists:
-            if task_list.get("wellknownListName") == "defaultList":
-                return task_list
         # Fallback: return first list if no default found
-        return lists[0] if lists else None
+        return self._lists_by_wkn.get("defaultList") or (lists[0] if lists else None)
 
-    def find_list_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+    def find_list_by_name(self, name: str, exact: bool = False) -> Optional[Dict[str, Any]]:
         """
-        Find task list by name
+        Find task list by name, falling back to a case-insensitive match
 
         Args:
             name: List name
+            exact: Only accept an exact name match (default: False)
 
         Returns:
             Found list information, returns None if not found
         """
-        lists = self.get_task_lists()
-        for task_list in lists:
-            if task_list.get("displayName") == name:
-                return task_list
-        return None
+        self.get_task_lists()
+        task_list = self._lists_by_name.get(name)
+        if task_list is None and not exact:
+            task_list = self._lists_by_folded.get(name.casefold())
+        return task_list
 
     def find_task_by_title(self, list_id: str, title: str) -> Optional[Dict[str, Any]]:
         """
@@ -487,13 +1171,280 @@ class MicrosoftTodoClient:
         Returns:
             Found task information, returns None if not found
         """
-        tasks = self.get_tasks(list_id)
+        by_title = self._tasks_by_title.get(list_id)
+        if by_title is None and list_id not in self._tasks_cache:
+            # Tasks not fetched yet: let Graph match the title instead of downloading the whole list
+            import requests
+
+            escaped = title.replace("'", "''")
+            try:
+                page = self._make_request(self._tasks_endpoint(list_id, extra_filter=f"title eq '{escaped}'"))
+            except requests.HTTPError:
+                page = None
+            if page is not None:
+                # Stop paging at the first exact match
+                return next((task for task in self._iter_pages(page) if task.get("title") == title), None)
+
+        if by_title is None:
+            # Keep the first task for duplicate titles, like a linear scan would
+            by_title = {}
+            for task in self.get_tasks(list_id):
+                by_title.setdefault(task.get("title"), task)
+            self._tasks_by_title[list_id] = by_title
+        return by_title.get(title)
+
+# ==================== Command Line Interface ====================
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON (orjson when available)"""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON from bytes (orjson when available)"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_pretty(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON with two-space indentation (orjson when available)"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _retry_after_seconds(value: Optional[str], default: int = 1) -> float:
+    """
+    Parse a Retry-After header given either as delay seconds or as an HTTP date
+
+    Args:
+        value: Header value, None if absent
+        default: Delay used when the value is missing or malformed (default: 1)
+
+    Returns:
+        Seconds to wait, never negative
+    """
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        # Rejects negative, infinite and NaN delays
+        return seconds if 0 <= seconds < float("inf") else default
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _dt(value: str) -> Dict[str, str]:
+    """Wrap a UTC timestamp as a Graph dateTimeTimeZone value"""
+    return {"dateTime": value, "timeZone": _UTC}
+
+
+def _due_str(task: Dict[str, Any]) -> Optional[str]:
+    """Return the raw due timestamp of a task, or None if it has no due date"""
+    return (task.get("dueDateTime") or _EMPTY).get("dateTime")
+
+
+def _graph_timestamp(moment: datetime) -> str:
+    """
+    Format a datetime like Graph dateTime values (2026-02-10T09:00:00.0000000)
+
+    Graph timestamps are zero-padded and fixed-width, so comparing them as strings
+    against this value orders them chronologically without parsing.
+
+    Args:
+        moment: Naive local wall-clock datetime, the calendar add -d writes due dates in
+
+    Returns:
+        Timestamp string with seven fractional digits
+    """
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%f") + "0"
+
+
+def _fmt_dt(value: str) -> str:
+    """Format a Graph timestamp for display as 'YYYY-MM-DD HH:MM:SS'"""
+    return value[:10] + " " + value[11:19]
+
+
+# Memoized by string: tasks often share due dates, and datetimes are immutable, so
+# repeated timestamps are parsed once without storing anything on the task dicts
+@lru_cache(maxsize=4096)
+def _parse_graph_dt(value: str) -> datetime:
+    """
+    Parse a Graph timestamp such as 2026-02-10T09:00:00.0000000 (optionally ending in Z)
+
+    Args:
+        value: Timestamp string returned by Graph
+
+    Returns:
+        Naive datetime with the wall-clock time as written; due dates are stored as local
+        calendar times, so they compare against datetime.now() like the string checks do
+    """
+    if ciso8601:
+        parsed = ciso8601.parse_datetime(value)
+    else:
+        value = value.rstrip("Z")
+        # fromisoformat before Python 3.11 accepts at most 6 fractional digits
+        parsed = datetime.fromisoformat(value[:26])
+    return parsed.replace(tzinfo=None)
+
+
+class _TaskSummary:
+    """Task counts gathered in a single pass over all lists"""
+
+    __slots__ = ("lists", "total", "completed", "pending", "high_priority", "overdue")
+
+    def __init__(self, lists: int, total: int, completed: int, high_priority: int, overdue: int):
+        self.lists = lists
+        self.total = total
+        self.completed = completed
+        self.pending = total - completed
+        self.high_priority = high_priority
+        self.overdue = overdue
+
+
+def _summarize_tasks(lists: Iterable[Tuple[str, List[Dict[str, Any]]]], now: datetime) -> _TaskSummary:
+    """
+    Count completed, high priority and overdue tasks in one streaming traversal
+
+    Args:
+        lists: (list name, tasks) pairs, as yielded by iter_all_tasks; each list is
+            counted as it arrives, so earlier ones are not kept around
+        now: Local wall-clock reference time for overdue checks (naive, like datetime.now())
+
+    Returns:
+        Aggregated task counts
+    """
+    get = dict.get
+    now_iso = _graph_timestamp(now)
+    list_count = total = completed = high_priority = overdue = 0
+
+    for _, tasks in lists:
+        list_count += 1
+        total += len(tasks)
         for task in tasks:
-            if task.get("title") == title:
-                return task
+            # Completed tasks never need their due date checked
+            if get(task, "status") == "completed":
+                completed += 1
+                continue
+
+            if get(task, "importance") == "high":
+                high_priority += 1
+
+            due_date = get(get(task, "dueDateTime") or _EMPTY, "dateTime")
+            if due_date and due_date < now_iso:
+                overdue += 1
+
+    return _TaskSummary(list_count, total, completed, high_priority, overdue)
+
+
+# Relative offsets such as '2d' (days) or '3h' (hours)
+_RELATIVE_RE = re.compile(r"([+-]?\d+)([dh])")
+
+# Dates with an optional time: '2026-12-31', '2026-12-31 14:30', '2026-12-31T14:30:00'
+_DATETIME_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2}))?)?")
+
+
+def _parse_datespec(value: str, default_hour: int = 0, allow_hours: bool = True) -> Optional[datetime]:
+    """
+    Parse a relative offset or a date with optional time, deciding the format with one regex match
+
+    Args:
+        value: '2d', '3h', '2026-12-31', '2026-12-31 14:30' or any other ISO 8601 datetime
+        default_hour: Hour used when only a date is given (default: 0)
+        allow_hours: Accept hour offsets such as '3h' (default: True)
+
+    Returns:
+        Parsed local datetime, or None if the value is invalid
+    """
+    match = _RELATIVE_RE.fullmatch(value)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        if unit == "d":
+            return datetime.now() + timedelta(days=amount)
+        return datetime.now() + timedelta(hours=amount) if allow_hours else None
+
+    match = _DATETIME_RE.fullmatch(value)
+    if match:
+        year, month, day, hour, minute, second = match.groups()
+        try:
+            if hour is None:
+                return datetime(int(year), int(month), int(day), default_hour)
+            return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second or 0))
+        except ValueError:
+            return None
+
+    # Less common ISO 8601 forms (fractional seconds, UTC offsets)
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
         return None
 
-# ==================== Command Line Interface ====================
+
+def _parse_due(value: str) -> Optional[str]:
+    """
+    Parse a due date argument
+
+    Args:
+        value: Number of days ('3'), days with suffix ('2d') or a date ('2026-12-31')
+
+    Returns:
+        Due date as 'YYYY-MM-DDT00:00:00' (time is ignored by the API), or None if invalid
+    """
+    # Plain number means days; the most common form skips date string parsing entirely
+    if value.isdigit():
+        return (date.today() + timedelta(days=int(value))).isoformat() + "T00:00:00"
+
+    due_datetime = _parse_datespec(value, allow_hours=False)
+    if due_datetime is None:
+        print(f"❌ Invalid date format for due date: {value}")
+        print("   Use YYYY-MM-DD, or relative format like '2d' or just '3'.")
+        return None
+    return due_datetime.strftime("%Y-%m-%d") + "T00:00:00"
+
+
+def _parse_reminder(value: str) -> Optional[str]:
+    """
+    Parse a reminder argument
+
+    Args:
+        value: Relative time ('3h', '2d'), date and time ('2026-12-31 14:30') or date only (09:00)
+
+    Returns:
+        Reminder time in ISO format, or None if invalid
+    """
+    reminder_datetime = _parse_datespec(value, default_hour=9)
+    if reminder_datetime is None:
+        print(f"❌ Invalid datetime format for reminder: {value}")
+        print("   Supported formats:")
+        print("   - Relative: '3h' (3 hours), '2d' (2 days)")
+        print("   - Date+Time: '2026-12-31 14:30' or '2026-12-31T14:30:00'")
+        print("   - Date only: '2026-12-31' (defaults to 09:00)")
+        return None
+    return reminder_datetime.isoformat()
+
+
+# Graph day names by datetime.weekday(), independent of the locale used by strftime("%A")
+_WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Fixed recurrence pattern fields by pattern name; weekly/monthly add the start date's day
+_REC_TEMPLATES = {
+    "daily": {"type": "daily"},
+    "weekdays": {"type": "weekly", "daysOfWeek": list(_WEEKDAY_NAMES[:5]), "interval": 1, "firstDayOfWeek": "sunday"},
+    "weekly": {"type": "weekly", "firstDayOfWeek": "sunday"},
+    "monthly": {"type": "absoluteMonthly"},
+}
 
 
 def _parse_recurrence(recurrence_str: str, start_date: datetime) -> Optional[Dict[str, Any]]:
@@ -522,40 +1473,28 @@ def _parse_recurrence(recurrence_str: str, start_date: datetime) -> Optional[Dic
     parts = recurrence_str.lower().split(":")
     pattern_type = parts[0]
     interval = int(parts[1]) if len(parts) > 1 else 1
-    
-    # Base recurrence structure
-    recurrence = {
-        "pattern": {
-            "interval": interval
-        },
+
+    template = _REC_TEMPLATES.get(pattern_type)
+    if template is None:
+        print(f"❌ Invalid recurrence pattern: {pattern_type}")
+        print("   Supported: daily, weekdays, weekly, monthly")
+        print("   With interval: daily:2, weekly:3, monthly:2")
+        return None
+
+    # Template fields override the interval (weekdays always repeats weekly)
+    pattern = {"interval": interval, **template}
+    if pattern_type == "weekly":
+        pattern["daysOfWeek"] = [_WEEKDAY_NAMES[start_date.weekday()]]
+    elif pattern_type == "monthly":
+        pattern["dayOfMonth"] = start_date.day
+
+    return {
+        "pattern": pattern,
         "range": {
             "type": "noEnd",
             "startDate": start_date.strftime("%Y-%m-%d")
         }
     }
-    
-    # Map pattern types
-    if pattern_type == "daily":
-        recurrence["pattern"]["type"] = "daily"
-    elif pattern_type == "weekdays":
-        recurrence["pattern"]["type"] = "weekly"
-        recurrence["pattern"]["daysOfWeek"] = ["monday", "tuesday", "wednesday", "thursday", "friday"]
-        recurrence["pattern"]["interval"] = 1
-        recurrence["pattern"]["firstDayOfWeek"] = "sunday"
-    elif pattern_type == "weekly":
-        recurrence["pattern"]["type"] = "weekly"
-        recurrence["pattern"]["daysOfWeek"] = [start_date.strftime("%A").lower()]
-        recurrence["pattern"]["firstDayOfWeek"] = "sunday"
-    elif pattern_type == "monthly":
-        recurrence["pattern"]["type"] = "absoluteMonthly"
-        recurrence["pattern"]["dayOfMonth"] = start_date.day
-    else:
-        print(f"❌ Invalid recurrence pattern: {pattern_type}")
-        print("   Supported: daily, weekdays, weekly, monthly")
-        print("   With interval: daily:2, weekly:3, monthly:2")
-        return None
-    
-    return recurrence
 
 
 def _error_list_not_found(list_name: str):
@@ -568,9 +1507,9 @@ def _error_task_not_found(task_name: str):
     print(f"❌ Task not found: {task_name}")
 
 
-def _get_list_or_error(client, list_name: str) -> Optional[Dict[str, Any]]:
+def _get_list_or_error(client, list_name: str, exact: bool = False) -> Optional[Dict[str, Any]]:
     """Find list by name, display error if not found"""
-    task_list = client.find_list_by_name(list_name)
+    task_list = client.find_list_by_name(list_name, exact)
     if not task_list:
         _error_list_not_found(list_name)
     return task_list
@@ -606,11 +1545,8 @@ def cmd_tasks(args, client):
     if not task_list:
         return
 
-    tasks = client.get_tasks(task_list["id"])
-
-    # Filter completed tasks
-    if not args.all:
-        tasks = [t for t in tasks if t.get("status") != "completed"]
+    # Completed tasks are filtered out by Graph unless requested
+    tasks = client.get_tasks(task_list["id"], include_completed=args.all, select=_TASK_VIEW_FIELDS)
 
     if not tasks:
         print(f'\n📋 No tasks in list "{args.list}"')
@@ -627,7 +1563,7 @@ def cmd_tasks(args, client):
         print(f"{i}. {status} {title} {priority_icon}")
 
         if args.verbose:
-            if task.get("body", {}).get("content"):
+            if task.get("body", _EMPTY).get("content"):
                 print(f"   Notes: {task['body']['content'][:100]}")
             if task.get("dueDateTime"):
                 print(f"   Due: {task['dueDateTime']['dateTime']}")
@@ -655,72 +1591,16 @@ def cmd_add(args, client):
     # Calculate due date (Microsoft To Do API only supports date, not time)
     due_date = None
     if args.due:
-        # Handle relative dates like "2d" (2 days) or plain number
-        if args.due.endswith("d"):
-            try:
-                days = int(args.due[:-1])
-                due_datetime = datetime.now() + timedelta(days=days)
-            except ValueError:
-                print(f"❌ Invalid format for due date days: {args.due}")
-                return
-        elif args.due.isdigit():
-            # Plain number means days
-            days = int(args.due)
-            due_datetime = datetime.now() + timedelta(days=days)
-        else:
-            # Assume it's a date string (YYYY-MM-DD)
-            try:
-                due_datetime = datetime.fromisoformat(args.due)
-            except ValueError:
-                print(f"❌ Invalid date format for due date: {args.due}")
-                print("   Use YYYY-MM-DD, or relative format like '2d' or just '3'.")
-                return
-        
-        # Format as date-only (API requirement: time is ignored)
-        due_date = due_datetime.strftime("%Y-%m-%d") + "T00:00:00"
+        due_date = _parse_due(args.due)
+        if due_date is None:
+            return  # Error already printed in _parse_due
 
     # Calculate reminder date/time (supports precise time)
     reminder_date = None
     if args.reminder:
-        # Handle relative times like "2d" (2 days) or "3h" (3 hours)
-        if args.reminder.endswith("h"):
-            try:
-                hours = int(args.reminder[:-1])
-                reminder_datetime = datetime.now() + timedelta(hours=hours)
-            except ValueError:
-                print(f"❌ Invalid format for reminder hours: {args.reminder}")
-                return
-        elif args.reminder.endswith("d"):
-            try:
-                days = int(args.reminder[:-1])
-                reminder_datetime = datetime.now() + timedelta(days=days)
-            except ValueError:
-                print(f"❌ Invalid format for reminder days: {args.reminder}")
-                return
-        else:
-            # Try to parse as datetime string
-            # Support formats: YYYY-MM-DD HH:MM, YYYY-MM-DDTHH:MM:SS, YYYY-MM-DD
-            try:
-                # First try ISO format
-                reminder_datetime = datetime.fromisoformat(args.reminder)
-            except ValueError:
-                # Try space-separated date and time: "2026-03-15 14:30"
-                try:
-                    reminder_datetime = datetime.strptime(args.reminder, "%Y-%m-%d %H:%M")
-                except ValueError:
-                    # Try date only: "2026-03-15" (will default to 09:00)
-                    try:
-                        date_only = datetime.strptime(args.reminder, "%Y-%m-%d")
-                        reminder_datetime = date_only.replace(hour=9, minute=0, second=0)
-                    except ValueError:
-                        print(f"❌ Invalid datetime format for reminder: {args.reminder}")
-                        print("   Supported formats:")
-                        print("   - Relative: '3h' (3 hours), '2d' (2 days)")
-                        print("   - Date+Time: '2026-12-31 14:30' or '2026-12-31T14:30:00'")
-                        print("   - Date only: '2026-12-31' (defaults to 09:00)")
-                        return
-        
-        reminder_date = reminder_datetime.isoformat()
+        reminder_date = _parse_reminder(args.reminder)
+        if reminder_date is None:
+            return  # Error already printed in _parse_reminder
 
     # Parse recurrence pattern and prepare start date
     recurrence = None
@@ -822,16 +1702,14 @@ def cmd_delete(args, client):
 def cmd_search(args, client):
     """Search for tasks"""
     all_tasks = client.get_all_tasks()
-    keyword = args.keyword.lower()
-
-    results = []
-    for list_name, tasks in all_tasks.items():
-        for task in tasks:
-            title = task.get("title", "").lower()
-            body = task.get("body", {}).get("content", "").lower()
-
-            if keyword in title or keyword in body:
-                results.append((list_name, task))
+    # Case-insensitive regex search avoids lowercasing every title and body
+    search = re.compile(re.escape(args.keyword), re.IGNORECASE).search
+    results = [
+        (list_name, task)
+        for list_name, tasks in all_tasks.items()
+        for task in tasks
+        if search(task.get("title", "")) or search(task.get("body", _EMPTY).get("content", ""))
+    ]
 
     if not results:
         print(f'\n🔍 No tasks found containing "{args.keyword}"')
@@ -844,14 +1722,23 @@ def cmd_search(args, client):
         priority = "⭐" if task.get("importance") == "high" else ""
         print(f"{status} {task['title']} {priority}")
         print(f"   List: {list_name}")
-        if args.verbose and task.get("body", {}).get("content"):
+        if args.verbose and task.get("body", _EMPTY).get("content"):
             print(f"   Notes: {task['body']['content'][:100]}")
 
 
 def cmd_today(args, client):
     """View tasks due today"""
-    all_tasks = client.get_all_tasks()
-    today = datetime.now().date()
+    current_day = date.today()
+    today = current_day.isoformat()
+    tomorrow = (current_day + timedelta(days=1)).isoformat()
+    all_tasks = client.get_all_tasks(
+        include_completed=False,
+        extra_filter=(
+            f"dueDateTime/dateTime ge '{today}T00:00:00'"
+            f" and dueDateTime/dateTime lt '{tomorrow}T00:00:00'"
+        ),
+        select=_TASK_TODAY_FIELDS,
+    )
 
     today_tasks = []
     for list_name, tasks in all_tasks.items():
@@ -859,11 +1746,10 @@ def cmd_today(args, client):
             if task.get("status") == "completed":
                 continue
 
-            due_date = task.get("dueDateTime", {}).get("dateTime")
-            if due_date:
-                task_date = datetime.fromisoformat(due_date.replace("Z", "+00:00")).date()
-                if task_date == today:
-                    today_tasks.append((list_name, task))
+            # Graph timestamps start with YYYY-MM-DD, so the day matches by prefix without parsing
+            due_date = _due_str(task)
+            if due_date and due_date.startswith(today):
+                today_tasks.append((list_name, task))
 
     if not today_tasks:
         print("\n📅 No tasks due today")
@@ -871,48 +1757,65 @@ def cmd_today(args, client):
 
     print(f"\n📅 Tasks due today ({len(today_tasks)} total):\n")
 
+    # Collect the output and write it at once instead of printing line by line
+    lines = []
     for list_name, task in today_tasks:
         priority = "⭐" if task.get("importance") == "high" else ""
-        print(f"[In Progress] {task['title']} {priority}")
-        print(f"   List: {list_name}")
+        lines.append(f"[In Progress] {task['title']} {priority}")
+        lines.append(f"   List: {list_name}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def cmd_overdue(args, client):
     """View overdue tasks"""
-    all_tasks = client.get_all_tasks()
+    # Local wall clock: add -d stores local calendar dates and today matches the local date
     now = datetime.now()
+    all_tasks = client.get_all_tasks(
+        include_completed=False,
+        extra_filter=f"dueDateTime/dateTime lt '{now.strftime('%Y-%m-%dT%H:%M:%S')}'",
+        select=_TASK_VIEW_FIELDS,
+    )
+    now_iso = _graph_timestamp(now)
 
+    # Entries sort by (-days overdue, fetch order): most overdue first, ties kept in list order
     overdue_tasks = []
     for list_name, tasks in all_tasks.items():
         for task in tasks:
             if task.get("status") == "completed":
                 continue
 
-            due_date = task.get("dueDateTime", {}).get("dateTime")
-            if due_date:
-                task_date = datetime.fromisoformat(due_date.replace("Z", "+00:00"))
-                if task_date < now:
-                    overdue_tasks.append((list_name, task, (now - task_date).days))
+            due_date = _due_str(task)
+            # Only tasks already known to be overdue are parsed, to count the days
+            if due_date and due_date < now_iso:
+                days = (now - _parse_graph_dt(due_date)).days
+                overdue_tasks.append((-days, len(overdue_tasks), list_name, task))
 
     if not overdue_tasks:
         print("\n✓ No overdue tasks")
         return
 
-    # Sort by overdue days
-    overdue_tasks.sort(key=lambda x: x[2], reverse=True)
+    total = len(overdue_tasks)
 
-    print(f"\n⚠️  Overdue tasks ({len(overdue_tasks)} total):\n")
+    # A heap selection is cheaper when only the top N are shown
+    if args.top is not None and args.top < total:
+        overdue_tasks = heapq.nsmallest(args.top, overdue_tasks)
+    else:
+        overdue_tasks.sort()
+
+    print(f"\n⚠️  Overdue tasks ({total} total):\n")
 
-    for list_name, task, days in overdue_tasks:
+    lines = []
+    for neg_days, _, list_name, task in overdue_tasks:
         priority = "⭐" if task.get("importance") == "high" else ""
-        print(f"[In Progress] {task['title']} {priority}")
-        print(f"   List: {list_name}")
-        print(f"   Overdue: {days} days")
+        lines.append(f"[In Progress] {task['title']} {priority}")
+        lines.append(f"   List: {list_name}")
+        lines.append(f"   Overdue: {-neg_days} days")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def cmd_pending(args, client):
     """Display incomplete tasks from all lists"""
-    all_tasks = client.get_all_tasks()
+    all_tasks = client.get_all_tasks(include_completed=False, select=_TASK_VIEW_FIELDS)
 
     pending_tasks = []
     for list_name, tasks in all_tasks.items():
@@ -924,86 +1827,88 @@ def cmd_pending(args, client):
         print("\n✓ No incomplete tasks")
         return
 
+    print(f"\n📋 All incomplete tasks ({len(pending_tasks)} total):\n")
+
+    # Collect the output and write it at once instead of printing line by line
+    lines = []
     # Group by list display
     if args.group:
-        print(f"\n📋 All incomplete tasks ({len(pending_tasks)} total):\n")
-        current_list = None
-        for list_name, task in pending_tasks:
-            if current_list != list_name:
-                current_list = list_name
-                print(f"\n📂 {list_name}:")
-
-            priority = "⭐" if task.get("importance") == "high" else ""
-            print(f"  [In Progress] {task['title']} {priority}")
-
-            if args.verbose:
-                if task.get("dueDateTime"):
-                    due = task["dueDateTime"]["dateTime"].replace("T", " ")
-                    print(f"      Due: {due}")
-                if task.get("body", {}).get("content"):
-                    print(f"      Notes: {task['body']['content'][:50]}...")
+        # Tasks are collected list by list, so each list's tasks are already adjacent
+        for list_name, group in groupby(pending_tasks, key=itemgetter(0)):
+            lines.append(f"\n📂 {list_name}:")
+            for _, task in group:
+                priority = "⭐" if task.get("importance") == "high" else ""
+                lines.append(f"  [In Progress] {task['title']} {priority}")
+
+                if args.verbose:
+                    if task.get("dueDateTime"):
+                        due = _fmt_dt(task["dueDateTime"]["dateTime"])
+                        lines.append(f"      Due: {due}")
+                    if task.get("body", _EMPTY).get("content"):
+                        lines.append(f"      Notes: {task['body']['content'][:50]}...")
     else:
         # Flat display
-        print(f"\n📋 All incomplete tasks ({len(pending_tasks)} total):\n")
         for list_name, task in pending_tasks:
             priority = "⭐" if task.get("importance") == "high" else ""
-            print(f"[In Progress] {task['title']} {priority}")
-            print(f"   List: {list_name}")
+            lines.append(f"[In Progress] {task['title']} {priority}")
+            lines.append(f"   List: {list_name}")
             if args.verbose and task.get("dueDateTime"):
-                due = task["dueDateTime"]["dateTime"].replace("T", " ")
-                print(f"   Due: {due}")
+                due = _fmt_dt(task["dueDateTime"]["dateTime"])
+                lines.append(f"   Due: {due}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def cmd_stats(args, client):
     """Display statistics"""
-    all_tasks = client.get_all_tasks()
-
-    total_lists = len(all_tasks)
-    total_tasks = 0
-    completed = 0
-    pending = 0
-    high_priority = 0
-    overdue_count = 0
-
-    now = datetime.now()
-
-    for tasks in all_tasks.values():
-        for task in tasks:
-            total_tasks += 1
-
-            if task.get("status") == "completed":
-                completed += 1
-            else:
-                pending += 1
-
-                if task.get("importance") == "high":
-                    high_priority += 1
-
-                due_date = task.get("dueDateTime", {}).get("dateTime")
-                if due_date:
-                    task_date = datetime.fromisoformat(due_date.replace("Z", "+00:00"))
-                    if task_date < now:
-                        overdue_count += 1
+    summary = _summarize_tasks(client.iter_all_tasks(), datetime.now())
 
     print("\n📊 Task Statistics:\n")
-    print(f"  Total lists: {total_lists}")
-    print(f"  Total tasks: {total_tasks}")
-    print(f"  Completed: {completed}")
-    print(f"  Pending: {pending}")
-    print(f"  High priority: {high_priority}")
-    print(f"  Overdue: {overdue_count}")
-
-    if total_tasks > 0:
-        completion_rate = (completed / total_tasks) * 100
+    print(f"  Total lists: {summary.lists}")
+    print(f"  Total tasks: {summary.total}")
+    print(f"  Completed: {summary.completed}")
+    print(f"  Pending: {summary.pending}")
+    print(f"  High priority: {summary.high_priority}")
+    print(f"  Overdue: {summary.overdue}")
+
+    if summary.total > 0:
+        completion_rate = (summary.completed / summary.total) * 100
         print(f"\n  Completion rate: {completion_rate:.1f}%")
 
 
 def cmd_export(args, client):
     """Export tasks"""
-    all_tasks = client.get_all_tasks()
-
-    with open(args.output, "w", encoding="utf-8") as f:
-        json.dump(all_tasks, f, ensure_ascii=False, indent=2)
+    # Write each list as soon as it is fetched and each task as it is encoded, so the
+    # encode buffer holds one task at a time (the fetched tasks stay in the client caches)
+    # Stream into a temporary file next to the target and only replace it once every list
+    # was written, so a failed fetch leaves any previous export intact
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(args.output)), prefix=os.path.basename(args.output) + ".", suffix=".tmp"
+    )
+    try:
+        with open(fd, "wb") as f:
+            f.write(b"{")
+            separator = b"\n"
+            for list_name, tasks in client.iter_all_tasks():
+                f.write(separator + b"  " + json.dumps(list_name, ensure_ascii=False).encode("utf-8") + b": [")
+                task_separator = b"\n    "
+                for task in tasks:
+                    f.write(task_separator + _dumps_pretty(task).replace(b"\n", b"\n    "))
+                    task_separator = b",\n    "
+                f.write(b"]" if not tasks else b"\n  ]")
+                separator = b",\n"
+            f.write(b"}" if separator == b"\n" else b"\n}")
+
+        # mkstemp creates the file 0600; give the export the permissions a plain open() would
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, args.output)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
     print(f"✓ Tasks exported to: {args.output}")
 
@@ -1018,18 +1923,19 @@ def cmd_create_list(args, client):
 
 def cmd_delete_list(args, client):
     """Delete a list"""
-    task_list = _get_list_or_error(client, args.name)
+    # Destructive, so only the exact list name is accepted
+    task_list = _get_list_or_error(client, args.name, exact=True)
     if not task_list:
         return
 
     if not args.yes:
-        confirm = input(f'Confirm delete list "{args.name}" and all its tasks? (y/n): ')
+        confirm = input(f'Confirm delete list "{task_list["displayName"]}" and all its tasks? (y/n): ')
         if confirm.lower() != "y":
             print("Cancelled")
             return
 
     client.delete_task_list(task_list["id"])
-    print(f"✓ List deleted: {args.name}")
+    print(f"✓ List deleted: {task_list['displayName']}")
 
 
 def cmd_detail(args, client):
@@ -1044,8 +1950,23 @@ def cmd_detail(args, client):
         print("❌ No task lists found")
         return
 
-    tasks = client.get_tasks(task_list["id"])
-    matched = [t for t in tasks if args.title.lower() in t.get("title", "").lower()]
+    needle = args.title.casefold()
+    tasks = client.search_tasks(task_list["id"], args.title)
+
+    # The server candidates stand in for the whole list only when they are complete: not cut off
+    # at the limit (older incomplete matches could be missing), and not narrowed by case, which
+    # holds if the title has no cased letters or Graph returned a hit differing only in case
+    matched = None
+    if tasks is not None and len(tasks) < client.SEARCH_LIMIT:
+        candidates = [t for t in tasks if needle in (t.get("title") or "").casefold()]
+        if args.title.lower() == args.title.upper() or any(
+            args.title not in (t.get("title") or "") for t in candidates
+        ):
+            matched = candidates
+
+    if matched is None:
+        tasks = client.get_tasks(task_list["id"])
+        matched = [t for t in tasks if needle in (t.get("title") or "").casefold()]
 
     if not matched:
         _error_task_not_found(args.title)
@@ -1053,14 +1974,12 @@ def cmd_detail(args, client):
 
     # Select task (prefer incomplete tasks, use latest modified)
     if len(matched) > 1:
-        pending = [t for t in matched if t.get("status") != "completed"]
+        # One pass ranks incomplete tasks first, then the latest modified
+        task = max(matched, key=lambda x: (x.get("status") != "completed", x.get("lastModifiedDateTime", "")))
+        pending = sum(1 for t in matched if t.get("status") != "completed")
         if pending:
-            pending.sort(key=lambda x: x.get("lastModifiedDateTime", ""), reverse=True)
-            task = pending[0]
-            print(f"ℹ️  Found {len(matched)} matching tasks ({len(pending)} incomplete), showing latest incomplete")
+            print(f"ℹ️  Found {len(matched)} matching tasks ({pending} incomplete), showing latest incomplete")
         else:
-            matched.sort(key=lambda x: x.get("lastModifiedDateTime", ""), reverse=True)
-            task = matched[0]
             print(f"ℹ️  Found {len(matched)} matching tasks (all completed), showing latest completed")
     else:
         task = matched[0]
@@ -1082,27 +2001,27 @@ def cmd_detail(args, client):
 
     # Dates
     if task.get("createdDateTime"):
-        created = task["createdDateTime"].replace("T", " ").replace("Z", "")
+        created = _fmt_dt(task["createdDateTime"])
         print(f"📅 Created: {created}")
 
     if task.get("lastModifiedDateTime"):
-        modified = task["lastModifiedDateTime"].replace("T", " ").replace("Z", "")
+        modified = _fmt_dt(task["lastModifiedDateTime"])
         print(f"📝 Modified: {modified}")
 
     if task.get("dueDateTime"):
-        due = task["dueDateTime"]["dateTime"].replace("T", " ")
+        due = _fmt_dt(task["dueDateTime"]["dateTime"])
         print(f"⏰ Due: {due}")
 
     if task.get("reminderDateTime"):
-        reminder = task["reminderDateTime"]["dateTime"].replace("T", " ")
+        reminder = _fmt_dt(task["reminderDateTime"]["dateTime"])
         print(f"🔔 Reminder: {reminder}")
 
     if task.get("completedDateTime"):
-        completed = task["completedDateTime"]["dateTime"].replace("T", " ")
+        completed = _fmt_dt(task["completedDateTime"]["dateTime"])
         print(f"✅ Completed: {completed}")
 
     # Notes
-    if task.get("body", {}).get("content"):
+    if task.get("body", _EMPTY).get("content"):
         print(f"\n📝 Notes:\n{task['body']['content']}")
 
     # Categories
@@ -1171,103 +2090,345 @@ def cmd_login_verify(args, client):
     if client.verify_device_code_flow():
         print("✓ You can now start using ms-todo-sync.py")
     else:
-        sys.exit(1)
+        raise _CLIExit(1)
+
+
+# Task importance values accepted by Graph, offered as --priority choices
+_PRIORITY_CHOICES = ("low", "normal", "high")
+
+
+def _add_list_arg(parser):
+    """Add the -l/--list option shared by the single-task commands"""
+    parser.add_argument("-l", "--list", help="List name (if not specified, uses your default list)")
+
+
+def _add_yes_arg(parser):
+    """Add the -y/--yes option shared by the delete commands"""
+    parser.add_argument("-y", "--yes", action="store_true", help="Skip confirmation")
+
+
+def _build_tasks_parser(parser):
+    parser.add_argument("list", help="List name")
+    parser.add_argument("-a", "--all", action="store_true", help="Include completed tasks")
+
+
+def _build_add_parser(parser):
+    parser.add_argument("title", help="Task title")
+    _add_list_arg(parser)
+    parser.add_argument("-d", "--due", help="Due date (e.g., '3' or '2d' for 2 days, '2026-12-31' for specific date). Note: Time is not supported for due dates.")
+    parser.add_argument("-r", "--reminder",
+                       help="Reminder time. Formats: '3h' (hours), '2d' (days), "
+                            "'2026-12-31 14:30' (date+time), '2026-12-31T14:30:00' (ISO), "
+                            "'2026-12-31' (date only, defaults to 09:00)")
+    parser.add_argument("-R", "--recurrence",
+                       help="Recurrence pattern. Formats: 'daily', 'weekdays', 'weekly', "
+                            "'monthly', or with interval like 'daily:2' (every 2 days), "
+                            "'weekly:3' (every 3 weeks)")
+    parser.add_argument("-p", "--priority", choices=_PRIORITY_CHOICES, default="normal", help="Priority")
+    parser.add_argument("-D", "--description", help="Task description")
+    parser.add_argument("-t", "--tags", help="Tags (comma separated)")
+    parser.add_argument("--create-list", action="store_true", help="Create list if not exists")
+
+
+def _build_complete_parser(parser):
+    parser.add_argument("title", help="Task title")
+    _add_list_arg(parser)
+
+
+def _build_delete_parser(parser):
+    parser.add_argument("title", help="Task title")
+    _add_list_arg(parser)
+    _add_yes_arg(parser)
+
+
+def _build_detail_parser(parser):
+    parser.add_argument("title", help="Task title (supports partial match)")
+    _add_list_arg(parser)
+
+
+def _build_search_parser(parser):
+    parser.add_argument("keyword", help="Search keyword")
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: '{value}'")
+    return number
+
+
+def _build_overdue_parser(parser):
+    parser.add_argument("-n", "--top", type=_positive_int, help="Only show the N most overdue tasks")
+
+
+def _build_pending_parser(parser):
+    parser.add_argument("-g", "--group", action="store_true", help="Group by list")
+
+
+def _build_export_parser(parser):
+    parser.add_argument("-o", "--output", default="todo_export.json", help="Output file name")
+
+
+def _build_create_list_parser(parser):
+    parser.add_argument("name", help="List name")
 
 
+def _build_delete_list_parser(parser):
+    parser.add_argument("name", help="List name")
+    _add_yes_arg(parser)
+
+
+def _build_login_parser(parser):
+    login_subparsers = parser.add_subparsers(dest="login_action", help="Login operation")
+    login_subparsers.add_parser("get", help="Get authentication info (verification code and login link)")
+    login_subparsers.add_parser("verify", help="Verify authentication code and complete login")
+
+
+# Command names with their help text and argument builder, in the order they are listed in --help
+_COMMAND_SPECS = {
+    "lists": ("List all task lists", None),
+    "tasks": ("List tasks in a list", _build_tasks_parser),
+    "add": ("Add a new task", _build_add_parser),
+    "complete": ("Mark task as completed", _build_complete_parser),
+    "delete": ("Delete task", _build_delete_parser),
+    "detail": ("View task details", _build_detail_parser),
+    "search": ("Search for tasks", _build_search_parser),
+    "today": ("View tasks due today", None),
+    "overdue": ("View overdue tasks", _build_overdue_parser),
+    "pending": ("Show all incomplete tasks", _build_pending_parser),
+    "stats": ("Show statistics", None),
+    "export": ("Export tasks to JSON file", _build_export_parser),
+    "create-list": ("Create a new list", _build_create_list_parser),
+    "delete-list": ("Delete list", _build_delete_list_parser),
+    "login": ("Authentication management", _build_login_parser),
+    "logout": ("Logout and clear cache", None),
+}
+
+# Global options that take no value and may precede the command
+_GLOBAL_FLAGS = frozenset({"-v", "--verbose", "--debug"})
+
+_HELP_FLAGS = frozenset({"-h", "--help"})
+
+_DESCRIPTION = "Microsoft To Do command line tool"
+_EPILOG = 'Example: ms-todo-sync.py add "Complete report" -l work -p high -d 3'
+
+
+def _sniff_command(argv: Sequence[str]) -> Optional[int]:
+    """
+    Find the command name in the arguments without building the parser
+
+    Args:
+        argv: Command line arguments (without the program name)
+
+    Returns:
+        Index of the first argument after the global flags, or None if there is none
+    """
+    for index, arg in enumerate(argv):
+        if arg not in _GLOBAL_FLAGS:
+            return index
+    return None
+
+
+# Heading argparse uses for the options section; it was renamed in Python 3.10
+_OPTIONS_HEADING = "options:" if sys.version_info >= (3, 10) else "optional arguments:"
+
+
+def format_help() -> str:
+    """
+    Render the top-level help from the command table, without building any parser
+
+    The static layout is argparse's output at 80 columns; other terminal widths wrap
+    differently, so they are rendered by the real parser instead.
+    """
+    # argparse wraps at the terminal width (COLUMNS or the tty size, 80 when unknown)
+    if shutil.get_terminal_size().columns != 80:
+        return create_parser().format_help()
+
+    choices = "{" + ",".join(_COMMAND_SPECS) + "}"
+    lines = [
+        "usage: ms-todo-sync.py [-h] [-v] [--debug]",
+        "                       " + choices,
+        "                       ...",
+        "",
+        _DESCRIPTION,
+        "",
+        "positional arguments:",
+        "  " + choices,
+        "                        Available commands",
+    ]
+    lines.extend(f"    {name:<20}{help_text}" for name, (help_text, _) in _COMMAND_SPECS.items())
+    lines.extend([
+        "",
+        _OPTIONS_HEADING,
+        "  -h, --help            show this help message and exit",
+        "  -v, --verbose         Show detailed information",
+        "  --debug               Enable debug mode (show API requests and responses)",
+        "",
+        _EPILOG,
+        "",
+    ])
+    return "\n".join(lines)
+
+
+class _HelpAction(argparse.Action):
+    """-h/--help for the top-level parser, printing the pre-rendered help"""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None):
+        super().__init__(option_strings=option_strings, dest=dest, default=default, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        sys.stdout.write(format_help())
+        parser.exit()
+
+
+@lru_cache(maxsize=None)
 def create_parser():
-    """Create command line argument parser"""
-    parser = argparse.ArgumentParser(
-        prog="ms-todo-sync.py",
-        description="Microsoft To Do command line tool",
-        epilog='Example: ms-todo-sync.py add "Complete report" -l work -p high -d 3',
-    )
+    """Create command line argument parser (built once per process)"""
+    parser = argparse.ArgumentParser(prog="ms-todo-sync.py", description=_DESCRIPTION, epilog=_EPILOG, add_help=False)
 
+    parser.add_argument("-h", "--help", action=_HelpAction, help="show this help message and exit")
     parser.add_argument("-v", "--verbose", action="store_true", help="Show detailed information")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode (show API requests and responses)")
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
-    # List management
-    subparsers.add_parser("lists", help="List all task lists")
-    
-    tasks_parser = subparsers.add_parser("tasks", help="List tasks in a list")
-    tasks_parser.add_argument("list", help="List name")
-    tasks_parser.add_argument("-a", "--all", action="store_true", help="Include completed tasks")
-
-    # Task operations
-    add_parser = subparsers.add_parser("add", help="Add a new task")
-    add_parser.add_argument("title", help="Task title")
-    add_parser.add_argument("-l", "--list", help="List name (if not specified, uses your default list)")
-    add_parser.add_argument("-d", "--due", help="Due date (e.g., '3' or '2d' for 2 days, '2026-12-31' for specific date). Note: Time is not supported for due dates.")
-    add_parser.add_argument("-r", "--reminder",
-                           help="Reminder time. Formats: '3h' (hours), '2d' (days), "
-                                "'2026-12-31 14:30' (date+time), '2026-12-31T14:30:00' (ISO), "
-                                "'2026-12-31' (date only, defaults to 09:00)")
-    add_parser.add_argument("-R", "--recurrence",
-                           help="Recurrence pattern. Formats: 'daily', 'weekdays', 'weekly', "
-                                "'monthly', or with interval like 'daily:2' (every 2 days), "
-                                "'weekly:3' (every 3 weeks)")
-    add_parser.add_argument("-p", "--priority", choices=["low", "normal", "high"], default="normal", help="Priority")
-    add_parser.add_argument("-D", "--description", help="Task description")
-    add_parser.add_argument("-t", "--tags", help="Tags (comma separated)")
-    add_parser.add_argument("--create-list", action="store_true", help="Create list if not exists")
-
-    complete_parser = subparsers.add_parser("complete", help="Mark task as completed")
-    complete_parser.add_argument("title", help="Task title")
-    complete_parser.add_argument("-l", "--list", help="List name (if not specified, uses your default list)")
-
-    delete_parser = subparsers.add_parser("delete", help="Delete task")
-    delete_parser.add_argument("title", help="Task title")
-    delete_parser.add_argument("-l", "--list", help="List name (if not specified, uses your default list)")
-    delete_parser.add_argument("-y", "--yes", action="store_true", help="Skip confirmation")
-
-    detail_parser = subparsers.add_parser("detail", help="View task details")
-    detail_parser.add_argument("title", help="Task title (supports partial match)")
-    detail_parser.add_argument("-l", "--list", help="List name (if not specified, uses your default list)")
-
-    search_parser = subparsers.add_parser("search", help="Search for tasks")
-    search_parser.add_argument("keyword", help="Search keyword")
-
-    # Task views
-    subparsers.add_parser("today", help="View tasks due today")
-    subparsers.add_parser("overdue", help="View overdue tasks")
-    
-    pending_parser = subparsers.add_parser("pending", help="Show all incomplete tasks")
-    pending_parser.add_argument("-g", "--group", action="store_true", help="Group by list")
+    for name, (help_text, build) in _COMMAND_SPECS.items():
+        command_parser = subparsers.add_parser(name, help=help_text)
+        if build is not None:
+            build(command_parser)
 
-    subparsers.add_parser("stats", help="Show statistics")
+    return parser
 
-    # Data management
-    export_parser = subparsers.add_parser("export", help="Export tasks to JSON file")
-    export_parser.add_argument("-o", "--output", default="todo_export.json", help="Output file name")
 
-    # List management (advanced)
-    create_list_parser = subparsers.add_parser("create-list", help="Create a new list")
-    create_list_parser.add_argument("name", help="List name")
+@lru_cache(maxsize=None)
+def _command_parser(command: str) -> argparse.ArgumentParser:
+    """Create the standalone argument parser of one command (built once per process)"""
+    # Same prog as the subparser so usage and error output match
+    parser = argparse.ArgumentParser(prog=f"ms-todo-sync.py {command}")
+    build = _COMMAND_SPECS[command][1]
+    if build is not None:
+        build(parser)
+    return parser
 
-    delete_list_parser = subparsers.add_parser("delete-list", help="Delete list")
-    delete_list_parser.add_argument("name", help="List name")
-    delete_list_parser.add_argument("-y", "--yes", action="store_true", help="Skip confirmation")
 
-    # Authentication
-    login_parser = subparsers.add_parser("login", help="Authentication management")
-    login_subparsers = login_parser.add_subparsers(dest="login_action", help="Login operation")
-    login_subparsers.add_parser("get", help="Get authentication info (verification code and login link)")
-    login_subparsers.add_parser("verify", help="Verify authentication code and complete login")
+# Exact argument lists of the option-free auth commands, resolved without argparse
+_FAST_ARGV = {
+    ("logout",): {"command": "logout"},
+    ("login", "get"): {"command": "login", "login_action": "get"},
+    ("login", "verify"): {"command": "login", "login_action": "verify"},
+}
 
-    subparsers.add_parser("logout", help="Logout and clear cache")
 
-    return parser
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """
+    Parse command line arguments
 
+    A recognized command is parsed by its own parser only, skipping the construction
+    of every other subparser, and top-level help is printed pre-rendered; unknown
+    commands and leading options other than the global flags go through the full
+    parser from create_parser().
 
-def main():
-    """Main function"""
-    parser = create_parser()
-    args = parser.parse_args()
+    Args:
+        argv: Command line arguments (without the program name)
+
+    Returns:
+        Parsed arguments, with command set to None if no command was given
+    """
+    fast_args = _FAST_ARGV.get(tuple(argv))
+    if fast_args is not None:
+        return argparse.Namespace(verbose=False, debug=False, **fast_args)
+
+    index = _sniff_command(argv)
+    if index is not None and argv[index] in _HELP_FLAGS:
+        sys.stdout.write(format_help())
+        sys.exit(0)
+    if index is None or argv[index] not in _COMMAND_SPECS:
+        return create_parser().parse_args(argv)
+
+    command = argv[index]
+    args, extras = _command_parser(command).parse_known_args(argv[index + 1:])
+    if extras:
+        # Leftovers are reported by the top-level parser, as with real subparsers
+        create_parser().error(f"unrecognized arguments: {' '.join(extras)}")
+
+    global_flags = argv[:index]
+    args.command = command
+    args.verbose = "-v" in global_flags or "--verbose" in global_flags
+    args.debug = "--debug" in global_flags
+    return args
+
+
+# Handlers of the login subcommands
+_LOGIN_ACTIONS = {
+    "get": cmd_login_get,
+    "verify": cmd_login_verify,
+}
+
+# Printed when a command needs authentication but no valid token is cached
+_NOT_LOGGED_IN_MSG = """
+❌ Not logged in
+
+Please use the following commands to login:
+  Step 1: Get authentication info
+    ms-todo-sync.py login get
+
+  Step 2: Verify authentication code (login)
+    ms-todo-sync.py login verify
+"""
+
+# Handlers of the commands that need an authenticated client
+_COMMANDS = {
+    "lists": cmd_lists,
+    "tasks": cmd_tasks,
+    "add": cmd_add,
+    "complete": cmd_complete,
+    "delete": cmd_delete,
+    "detail": cmd_detail,
+    "search": cmd_search,
+    "today": cmd_today,
+    "overdue": cmd_overdue,
+    "pending": cmd_pending,
+    "stats": cmd_stats,
+    "export": cmd_export,
+    "create-list": cmd_create_list,
+    "delete-list": cmd_delete_list,
+}
+
+
+def _print_error(e: Exception, verbose: bool):
+    """Print a command error, with the traceback in verbose mode"""
+    print(f"❌ Error: {e}")
+    if verbose:
+        # Only needed on the error path, so keep it off the startup path
+        import traceback
+
+        traceback.print_exc()
+
+
+class _CLIExit(BaseException):
+    """
+    Raised to end the command with a non-zero exit code
+
+    Derives from BaseException, like SystemExit, so the generic error handling
+    around command handlers lets it through to main()
+    """
+
+    def __init__(self, code: int):
+        super().__init__(code)
+        self.code = code
+
+
+def _run(args: argparse.Namespace):
+    """Run the parsed command; failures raise _CLIExit"""
+    verbose = args.verbose
 
     # If no command provided, show help
     if not args.command:
-        parser.print_help()
+        sys.stdout.write(format_help())
         return
 
     # Create client
@@ -1279,65 +2440,53 @@ def main():
         return
 
     if args.command == "login":
-        if not args.login_action:
+        handler = _LOGIN_ACTIONS.get(args.login_action)
+        if handler is None:
             print("Please specify login operation: get (get auth info) or verify (verify auth)")
-            sys.exit(1)
+            raise _CLIExit(1)
 
         try:
-            if args.login_action == "get":
-                cmd_login_get(args, client)
-            elif args.login_action == "verify":
-                cmd_login_verify(args, client)
+            handler(args, client)
         except Exception as e:
-            print(f"❌ Error: {e}")
-            if args.verbose:
-                import traceback
-
-                traceback.print_exc()
-            sys.exit(1)
+            _print_error(e, verbose)
+            raise _CLIExit(1)
         return
 
     # Other commands need authentication
     if not client.authenticate():
-        print("\n❌ Not logged in")
-        print("\nPlease use the following commands to login:")
-        print("  Step 1: Get authentication info")
-        print("    ms-todo-sync.py login get")
-        print("\n  Step 2: Verify authentication code (login)")
-        print("    ms-todo-sync.py login verify")
-        sys.exit(1)
-
-    # Execute command
-    commands = {
-        "lists": cmd_lists,
-        "tasks": cmd_tasks,
-        "add": cmd_add,
-        "complete": cmd_complete,
-        "delete": cmd_delete,
-        "detail": cmd_detail,
-        "search": cmd_search,
-        "today": cmd_today,
-        "overdue": cmd_overdue,
-        "pending": cmd_pending,
-        "stats": cmd_stats,
-        "export": cmd_export,
-        "create-list": cmd_create_list,
-        "delete-list": cmd_delete_list,
-    }
+        sys.stdout.write(_NOT_LOGGED_IN_MSG)
+        raise _CLIExit(1)
 
-    if args.command in commands:
+    # Execute command (argparse has already rejected unknown commands)
+    try:
+        _COMMANDS[args.command](args, client)
+    except Exception as e:
+        _print_error(e, verbose)
+        raise _CLIExit(1)
+
+
+def main():
+    """Main function"""
+    # Shell completion (optional argcomplete) answers from the full parser and exits
+    # before any client is created; normal runs never import it
+    if "_ARGCOMPLETE" in os.environ:
         try:
-            commands[args.command](args, client)
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            if args.verbose:
-                import traceback
+            import argcomplete  # type: ignore
+        except ImportError:
+            pass
+        else:
+            argcomplete.autocomplete(create_parser())
 
-                traceback.print_exc()
-            sys.exit(1)
-    else:
-        print(f"Unknown command: {args.command}")
-        sys.exit(1)
+    # Without arguments there is nothing to parse: show help straight away
+    if len(sys.argv) == 1:
+        sys.stdout.write(format_help())
+        return
+
+    args = parse_args(sys.argv[1:])
+    try:
+        _run(args)
+    except _CLIExit as e:
+        sys.exit(e.code)
 
 
 if __name__ == "__main__":